@@ -7,6 +7,7 @@ Contains clearly separated layers of the deterministic pipeline:
 • processing_layer
 • provenance_layer
 • output_layer
+• hash_cache
 • utils
 • errors
 
@@ -20,6 +21,7 @@ __all__ = [
     "processing_layer",
     "provenance_layer",
     "output_layer",
+    "hash_cache",
     "utils",
     "errors",
 ]
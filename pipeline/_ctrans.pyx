@@ -0,0 +1,80 @@
+# cython: language_level=3
+"""
+_ctrans.pyx
+
+Optional compiled kernel for ASCII upper/lower case mapping.
+
+Responsibilities:
+• Map a-z <-> A-Z over a byte buffer, 32 bytes per step with AVX2
+• Leave every other byte unchanged
+
+Architectural Constraints:
+• Pure functions only (same guarantees as processing_layer)
+• Accepts any C-contiguous bytes-like object (bytes, bytearray,
+  memoryview), like the bytes.translate fallback; always returns bytes
+• Callers must only pass ASCII data; output equals str.upper/lower for it
+• The pipeline falls back to bytes.translate when this is not built
+
+Build (from the project root):
+    CFLAGS="-O3 -mavx2" cythonize -i pipeline/_ctrans.pyx
+
+Without -mavx2 (or on non-x86 targets) the scalar loop is compiled instead.
+"""
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize
+
+
+cdef extern from *:
+    """
+    #include <stddef.h>
+    #if defined(__AVX2__)
+    #include <immintrin.h>
+    #endif
+
+    /* ASCII letters differ from their other case only in bit 0x20. */
+    static void ascii_case_map(const unsigned char *src, size_t n,
+                               unsigned char *dst, int to_upper)
+    {
+        const unsigned char lo = to_upper ? 'a' : 'A';
+        const unsigned char hi = to_upper ? 'z' : 'Z';
+        size_t i = 0;
+    #if defined(__AVX2__)
+        const __m256i below = _mm256_set1_epi8((char)(lo - 1));
+        const __m256i above = _mm256_set1_epi8((char)(hi + 1));
+        const __m256i flip = _mm256_set1_epi8(0x20);
+        for (; i + 32 <= n; i += 32) {
+            __m256i v = _mm256_loadu_si256((const __m256i *)(src + i));
+            __m256i mask = _mm256_and_si256(_mm256_cmpgt_epi8(v, below),
+                                            _mm256_cmpgt_epi8(above, v));
+            v = _mm256_xor_si256(v, _mm256_and_si256(mask, flip));
+            _mm256_storeu_si256((__m256i *)(dst + i), v);
+        }
+    #endif
+        for (; i < n; i++) {
+            unsigned char c = src[i];
+            dst[i] = (c >= lo && c <= hi) ? (unsigned char)(c ^ 0x20) : c;
+        }
+    }
+    """
+    void ascii_case_map(const unsigned char *src, size_t n,
+                        unsigned char *dst, int to_upper) nogil
+
+
+cdef bytes _case_map(const unsigned char[::1] data, int to_upper):
+    cdef Py_ssize_t n = data.shape[0]
+    if n == 0:
+        return b""
+    cdef bytes out = PyBytes_FromStringAndSize(NULL, n)
+    cdef const unsigned char *src = &data[0]
+    cdef unsigned char *dst = <unsigned char *>PyBytes_AS_STRING(out)
+    with nogil:
+        ascii_case_map(src, <size_t>n, dst, to_upper)
+    return out
+
+
+def ascii_upper(const unsigned char[::1] data):
+    return _case_map(data, 1)
+
+
+def ascii_lower(const unsigned char[::1] data):
+    return _case_map(data, 0)
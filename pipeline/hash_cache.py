@@ -0,0 +1,113 @@
+"""
+hash_cache.py
+
+Persistent cache of input file content hashes.
+
+Responsibilities:
+• Store content hashes keyed by (path, inode, mtime_ns, ctime_ns, size, algo)
+• Return a cached hash only when every key field matches
+
+Architectural Constraints:
+• Performs I/O only on its own SQLite database
+• Must never change a hash value: a hit returns what hashing would return
+• Safe to share across the input layer's worker threads
+
+A missing or unusable cache is never an error; hashing simply runs.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+_CACHE_SUBPATH = Path(".cache") / "deterministic_pipeline" / "hashes.sqlite"
+
+# mtime alone is not enough: cp -p, rsync -t and os.utime restore it after a
+# rewrite. ctime changes on every write and cannot be set from user space,
+# and the inode changes when a file is replaced by rename.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT NOT NULL,
+    ino INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    algo TEXT NOT NULL,
+    hexdigest TEXT NOT NULL,
+    PRIMARY KEY (path, ino, mtime_ns, ctime_ns, size, algo)
+)
+"""
+
+# Table from before the key included inode and ctime.
+_DROP_OLD_SCHEMA = "DROP TABLE IF EXISTS hashes"
+
+
+class HashCache:
+    def __init__(self, db_path: Path) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(_DROP_OLD_SCHEMA)
+            self._conn.execute(_SCHEMA)
+
+    def get(
+        self, path: str, ino: int, mtime_ns: int, ctime_ns: int, size: int, algo: str
+    ) -> Optional[str]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT hexdigest FROM file_hashes"
+                    " WHERE path = ? AND ino = ? AND mtime_ns = ? AND ctime_ns = ?"
+                    " AND size = ? AND algo = ?",
+                    (path, ino, mtime_ns, ctime_ns, size, algo),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def put(
+        self, path: str, ino: int, mtime_ns: int, ctime_ns: int, size: int, algo: str,
+        hexdigest: str,
+    ) -> None:
+        # Only the latest version of each file is kept.
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "DELETE FROM file_hashes WHERE path = ? AND algo = ?", (path, algo)
+                )
+                self._conn.execute(
+                    "INSERT INTO file_hashes"
+                    " (path, ino, mtime_ns, ctime_ns, size, algo, hexdigest)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (path, ino, mtime_ns, ctime_ns, size, algo, hexdigest),
+                )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _default_cache_path() -> Optional[Path]:
+    # Resolved at call time, not import time: without a resolvable home
+    # directory Path.home() raises (3.12+) or returns a literal "~" (<= 3.11).
+    try:
+        home = Path.home()
+    except RuntimeError:
+        return None
+    if not home.is_absolute():
+        return None
+    return home / _CACHE_SUBPATH
+
+
+def open_hash_cache(db_path: Optional[Path] = None) -> Optional[HashCache]:
+    if db_path is None:
+        db_path = _default_cache_path()
+        if db_path is None:
+            return None
+    try:
+        return HashCache(db_path)
+    except (OSError, sqlite3.Error):
+        return None
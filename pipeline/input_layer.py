@@ -7,9 +7,9 @@ Responsibilities:
 • Validate input file paths
 • Load and validate configuration
 • Enforce explicit parameter schema (no hidden defaults)
-• Compute deterministic SHA256 hashes for:
-    - Raw input files
-    - Canonicalized config
+• Compute deterministic hashes for:
+    - Raw input files (explicit content_hash_algo), in the same pass that reads them
+    - Canonicalized config (SHA256)
 
 Architectural Constraints:
 • May perform I/O (file reads)
@@ -21,18 +21,27 @@ This layer establishes deterministic input identity.
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from .errors import ConfigError, InputValidationError
-from .utils import sha256_file, sha256_json
+from .hash_cache import HashCache
+from .utils import (
+    DEFAULT_CONTENT_HASH_ALGO,
+    content_hash_file,
+    read_and_hash,
+    sha256_json,
+    validate_content_hash_algo,
+)
 
 
 @dataclass(frozen=True)
 class LoadedInputs:
     input_paths: List[Path]
-    input_hashes: Dict[str, str]
+    content_hash_algo: str
     config: Dict[str, Any]
     config_hash: str
     pipeline_version: str
@@ -48,14 +57,20 @@ def _validate_paths(paths: List[Path]) -> None:
             raise InputValidationError(f"Input path is not a file: {p}")
 
 
-def _load_config(config_path: Path) -> Dict[str, Any]:
+def _read_config_text(config_path: Path) -> str:
     if not config_path.exists():
         raise ConfigError(f"Config file does not exist: {config_path}")
     if not config_path.is_file():
         raise ConfigError(f"Config path is not a file: {config_path}")
 
     try:
-        raw = config_path.read_text(encoding="utf-8")
+        return config_path.read_text(encoding="utf-8")
+    except Exception as e:
+        raise ConfigError(f"Failed to parse config as JSON: {e}") from e
+
+
+def _parse_config(raw: str) -> Dict[str, Any]:
+    try:
         cfg = json.loads(raw)
     except Exception as e:
         raise ConfigError(f"Failed to parse config as JSON: {e}") from e
@@ -77,23 +92,92 @@ def _load_config(config_path: Path) -> Dict[str, Any]:
     return cfg
 
 
-def load_validate_hash(input_files: List[str], config_file: str, pipeline_version: str) -> LoadedInputs:
+def _load_config(config_path: Path) -> Dict[str, Any]:
+    return _parse_config(_read_config_text(config_path))
+
+
+@lru_cache(maxsize=32)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> Tuple[str, str]:
+    # mtime_ns and size are part of the cache key: an edited file is reloaded.
+    # The validated text is cached rather than the parsed dict: re-parsing it
+    # with json.loads is cheaper than a deep copy, and every caller gets a
+    # fresh dict of its own.
+    raw = _read_config_text(Path(path))
+    return raw, sha256_json(_parse_config(raw), size_hint=size)
+
+
+def load_validate_hash(
+    input_files: List[str],
+    config_file: str,
+    pipeline_version: str,
+    content_hash_algo: str = DEFAULT_CONTENT_HASH_ALGO,
+) -> LoadedInputs:
     if not pipeline_version.strip():
         raise InputValidationError("pipeline_version must be non-empty")
 
+    try:
+        validate_content_hash_algo(content_hash_algo)
+    except ValueError as e:
+        raise InputValidationError(str(e)) from e
+
     paths = [Path(p).resolve() for p in input_files]
     _validate_paths(paths)
 
     cfg_path = Path(config_file).resolve()
-    cfg = _load_config(cfg_path)
-
-    input_hashes = {str(p): sha256_file(p) for p in paths}
-    config_hash = sha256_json(cfg)
+    try:
+        st = cfg_path.stat()
+    except OSError:
+        cfg = _load_config(cfg_path)  # raises the explicit ConfigError
+        config_hash = sha256_json(cfg)
+    else:
+        raw, config_hash = _load_config_cached(str(cfg_path), st.st_mtime_ns, st.st_size)
+        cfg = json.loads(raw)
 
     return LoadedInputs(
         input_paths=paths,
-        input_hashes=input_hashes,
+        content_hash_algo=content_hash_algo,
         config=cfg,
         config_hash=config_hash,
         pipeline_version=pipeline_version.strip(),
     )
+
+
+def read_inputs_and_hash(
+    paths: List[Path],
+    *,
+    algo: str = DEFAULT_CONTENT_HASH_ALGO,
+) -> Tuple[Dict[str, bytes], Dict[str, str]]:
+    # Each file is read once; its hash is always computed from the bytes just
+    # read, never taken from the hash cache. Hashers release the GIL while
+    # digesting, so files are handled concurrently.
+    ordered = sorted(paths)
+    if not ordered:
+        return {}, {}
+    with ThreadPoolExecutor(max_workers=min(8, len(ordered))) as executor:
+        results = list(executor.map(partial(read_and_hash, algo=algo), ordered))
+
+    raw_inputs = {}
+    input_hashes = {}
+    for p, (data, digest) in zip(ordered, results):
+        key = str(p)
+        raw_inputs[key] = data
+        input_hashes[key] = digest
+    return raw_inputs, input_hashes
+
+
+def hash_inputs(
+    paths: List[Path],
+    *,
+    algo: str = DEFAULT_CONTENT_HASH_ALGO,
+    cache: Optional[HashCache] = None,
+) -> Dict[str, str]:
+    # Hashes without returning the bytes, for runs whose artifacts are copies
+    # of the inputs. Large files are hashed through mmap, not Python buffers.
+    # Since the bytes are never read into Python, this is where the hash
+    # cache (keyed by path, inode, mtime, ctime and size) pays off.
+    ordered = sorted(paths)
+    if not ordered:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(8, len(ordered))) as executor:
+        digests = list(executor.map(partial(content_hash_file, algo=algo, cache=cache), ordered))
+    return {str(p): d for p, d in zip(ordered, digests)}
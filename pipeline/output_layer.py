@@ -4,7 +4,8 @@ output_layer.py
 Output boundary of the pipeline.
 
 Responsibilities:
-• Write processed artifacts to disk
+• Write processed artifacts to disk, one at a time as they are produced
+• Copy inputs to artifacts in-kernel when the transform is the identity
 • Write human-readable provenance.json
 • Ensure explicit and visible write behavior
 
@@ -20,34 +21,199 @@ No partial success marking.
 
 
 import json
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Iterable, Optional, Tuple
 
-from .utils import canonical_json_dumps
-from .processing_layer import ProcessedArtifact
 from .provenance_layer import Provenance
+from .utils import exact_orjson_dumps
 
+# Same flags and mode as open(path, "wb"); each file is written with raw
+# os.write calls, bypassing the buffered io stack for single-shot payloads.
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+_USE_DIR_FD = os.open in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+_COPY_CHUNK = 1024 * 1024
 
-def write_outputs(*, out_dir: str, processed: ProcessedArtifact, provenance: Provenance) -> Dict[str, str]:
+
+def _write_all(fd: int, content: bytes) -> None:
+    view = memoryview(content)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_file(name: str, content: bytes, dir_fd=None) -> None:
+    fd = os.open(name, _WRITE_FLAGS, 0o666, dir_fd=dir_fd)
+    try:
+        _write_all(fd, content)
+    finally:
+        os.close(fd)
+
+
+def _copy_fd(in_fd: int, out_fd: int) -> None:
+    # Prefer copies that keep the data in the kernel: copy_file_range (may
+    # reflink on CoW filesystems), then sendfile, then a plain read/write
+    # loop. A fast path that is unsupported here fails before copying
+    # anything; offsets are reset anyway before trying the next one.
+    size = os.fstat(in_fd).st_size
+    count = max(size, _COPY_CHUNK)
+
+    # Files that report no size (procfs, sysfs) only copy correctly with
+    # read(). Otherwise a fast path that copies nothing at all is not trusted
+    # as EOF either: some kernels and filesystems return 0 without copying
+    # (the same guard as shutil's fast-copy helpers).
+    if size and hasattr(os, "copy_file_range"):
+        try:
+            copied = 0
+            while True:
+                n = os.copy_file_range(in_fd, out_fd, count)
+                if not n:
+                    break
+                copied += n
+            if copied:
+                return
+        except OSError:
+            pass
+        _rewind(in_fd, out_fd)
+
+    if size and hasattr(os, "sendfile"):
+        try:
+            offset = 0
+            while True:
+                sent = os.sendfile(out_fd, in_fd, offset, count)
+                if not sent:
+                    break
+                offset += sent
+            if offset:
+                return
+        except OSError:
+            pass
+        _rewind(in_fd, out_fd)
+
+    while True:
+        chunk = os.read(in_fd, _COPY_CHUNK)
+        if not chunk:
+            return
+        _write_all(out_fd, chunk)
+
+
+def _rewind(in_fd: int, out_fd: int) -> None:
+    os.lseek(in_fd, 0, os.SEEK_SET)
+    os.lseek(out_fd, 0, os.SEEK_SET)
+    os.ftruncate(out_fd, 0)
+
+
+def _copy_file(src: str, name: str, dir_fd=None) -> None:
+    in_fd = os.open(src, _READ_FLAGS)
+    try:
+        out_fd = os.open(name, _WRITE_FLAGS, 0o666, dir_fd=dir_fd)
+        try:
+            _copy_fd(in_fd, out_fd)
+        finally:
+            os.close(out_fd)
+    finally:
+        os.close(in_fd)
+
+
+def _write_provenance(path: str, data: Dict[str, Any]) -> None:
+    # The same bytes with or without orjson: exact_orjson_dumps declines
+    # anything the stdlib would format differently.
+    encoded = exact_orjson_dumps(data, indent=True)
+    if encoded is not None:
+        _write_file(path, encoded)
+        return
+    # json.dump streams chunks to the file instead of building one big string.
+    try:
+        with open(path, "w", encoding="utf-8", newline="\n") as fp:
+            json.dump(data, fp, indent=2, sort_keys=True, ensure_ascii=False)
+    except UnicodeEncodeError:
+        # Undecodable file names surface as lone surrogates, which have no
+        # UTF-8 encoding; escape them (and everything non-ASCII) instead.
+        with open(path, "w", encoding="utf-8", newline="\n") as fp:
+            json.dump(data, fp, indent=2, sort_keys=True)
+
+
+def _prepare_out_dirs(out_dir: str) -> Tuple[str, str]:
     out_path = Path(out_dir).resolve()
     out_path.mkdir(parents=True, exist_ok=True)
 
+    # provenance.json marks a completed run. Drop any previous one before the
+    # first artifact is touched, so a run that fails mid-write never leaves
+    # new artifacts next to an old, now-wrong provenance record.
+    prov_file = out_path / "provenance.json"
+    prov_file.unlink(missing_ok=True)
+
     artifacts_dir = out_path / "artifacts"
     artifacts_dir.mkdir(parents=True, exist_ok=True)
+    return str(prov_file), str(artifacts_dir)
+
+
+def _open_dir_fd(path: str) -> Optional[int]:
+    # Artifacts are opened relative to one directory fd where supported, so
+    # the directory path is resolved only once.
+    return os.open(path, os.O_RDONLY | os.O_DIRECTORY) if _USE_DIR_FD else None
+
+
+def _artifact_name(input_path: str) -> str:
+    return f"{os.path.basename(input_path)}.processed"
+
+
+def write_outputs(
+    *,
+    out_dir: str,
+    processed: Iterable[Tuple[str, bytes]],
+    provenance: Provenance,
+) -> Dict[str, str]:
+    prov_file, artifacts_root = _prepare_out_dirs(out_dir)
 
     written = {}
 
-    for input_path, content in sorted(processed.items.items()):
-        name = Path(input_path).name
-        out_file = artifacts_dir / f"{name}.processed"
-        out_file.write_bytes(content)
-        written[input_path] = str(out_file)
+    # Artifacts are written in the order given (ProcessedArtifact and
+    # iter_process are already sorted by path); each buffer can be released
+    # as soon as it is on disk.
+    dir_fd = _open_dir_fd(artifacts_root)
+    try:
+        for input_path, content in processed:
+            name = _artifact_name(input_path)
+            out_file = os.path.join(artifacts_root, name)
+            _write_file(name if dir_fd is not None else out_file, content, dir_fd)
+            written[input_path] = out_file
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
 
-    prov_file = out_path / "provenance.json"
-    prov_file.write_text(
-        json.dumps(provenance.data, indent=2, sort_keys=True),
-        encoding="utf-8",
-    )
-    written["provenance"] = str(prov_file)
+    _write_provenance(prov_file, provenance.data)
+    written["provenance"] = prov_file
+
+    return written
+
+
+def copy_outputs(
+    *,
+    out_dir: str,
+    input_paths: Iterable[Path],
+    provenance: Provenance,
+) -> Dict[str, str]:
+    """
+    Identity-transform counterpart of write_outputs: each artifact is a
+    byte-for-byte copy of its input, made without loading it into Python.
+    """
+    prov_file, artifacts_root = _prepare_out_dirs(out_dir)
+
+    written = {}
+
+    dir_fd = _open_dir_fd(artifacts_root)
+    try:
+        for input_path in sorted(str(p) for p in input_paths):
+            name = _artifact_name(input_path)
+            out_file = os.path.join(artifacts_root, name)
+            _copy_file(input_path, name if dir_fd is not None else out_file, dir_fd)
+            written[input_path] = out_file
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    _write_provenance(prov_file, provenance.data)
+    written["provenance"] = prov_file
 
     return written
@@ -19,40 +19,138 @@ Architectural Constraints:
 Function signature defines full behavior:
 (raw_inputs, parameters) -> processed artifacts
 
+iter_process yields artifacts one at a time (sorted by path) so callers can
+write each one before the next is produced; process collects them.
+process_parallel fans the same per-file transform out to worker processes;
+its output is identical to process.
+
 This module must remain environment-agnostic and deterministic.
 """
 
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict
+from typing import Callable, Dict, Iterator, Optional, Tuple
 
 
 @dataclass(frozen=True)
 class ProcessedArtifact:
-    items: Dict[str, bytes]
+    # Parallel tuples kept in sorted path order: contents[i] belongs to paths[i].
+    paths: Tuple[str, ...]
+    contents: Tuple[bytes, ...]
 
+    def __post_init__(self) -> None:
+        if len(self.paths) != len(self.contents):
+            raise ValueError("paths and contents must have the same length")
+        if list(self.paths) != sorted(self.paths):
+            raise ValueError("paths must be sorted")
 
-def _transform_bytes(data: bytes, transform: str) -> bytes:
-    if transform == "noop":
-        return data
-    text = data.decode("utf-8", errors="strict")
-    if transform == "upper":
-        return text.upper().encode("utf-8")
-    if transform == "lower":
-        return text.lower().encode("utf-8")
-    raise ValueError(f"Unsupported transform: {transform}")
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        return zip(self.paths, self.contents)
 
+    def as_dict(self) -> Dict[str, bytes]:
+        return dict(zip(self.paths, self.contents))
 
-def process(raw_inputs: Dict[str, bytes], *, parameters: Dict[str, object]) -> ProcessedArtifact:
+
+# Constant ASCII case-mapping tables. For pure-ASCII input, str.upper/lower
+# only change a-z/A-Z, so bytes.translate gives identical results without a
+# decode/encode round trip.
+_IDENTITY = bytes(range(256))
+_UPPER_TABLE = bytes.maketrans(_IDENTITY, bytes(c - 32 if 97 <= c <= 122 else c for c in range(256)))
+_LOWER_TABLE = bytes.maketrans(_IDENTITY, bytes(c + 32 if 65 <= c <= 90 else c for c in range(256)))
+
+try:  # Optional compiled SIMD kernel, see _ctrans.pyx for build instructions.
+    from ._ctrans import ascii_lower as _ascii_lower, ascii_upper as _ascii_upper
+except ImportError:
+    def _ascii_upper(data: bytes) -> bytes:
+        return data.translate(_UPPER_TABLE)
+
+    def _ascii_lower(data: bytes) -> bytes:
+        return data.translate(_LOWER_TABLE)
+
+
+def _noop_bytes(data: bytes) -> bytes:
+    return data
+
+
+def _upper_bytes(data: bytes) -> bytes:
+    if data.isascii():
+        return _ascii_upper(data)
+    return data.decode("utf-8", errors="strict").upper().encode("utf-8")
+
+
+def _lower_bytes(data: bytes) -> bytes:
+    if data.isascii():
+        return _ascii_lower(data)
+    return data.decode("utf-8", errors="strict").lower().encode("utf-8")
+
+
+_TRANSFORMS: Dict[str, Callable[[bytes], bytes]] = {
+    "noop": _noop_bytes,
+    "upper": _upper_bytes,
+    "lower": _lower_bytes,
+}
+
+
+def _resolve_transform(parameters: Dict[str, object]) -> Callable[[bytes], bytes]:
+    # Validates parameters and picks the concrete transform once per run,
+    # so the per-file loop does no string dispatch.
     if "transform" not in parameters:
         raise ValueError("Missing parameter: transform")
     if "seed" not in parameters:
         raise ValueError("Missing parameter: seed")
 
     transform = parameters["transform"]
+    try:
+        return _TRANSFORMS[transform]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unsupported transform: {transform}") from None
+
+
+def is_identity_transform(parameters: Dict[str, object]) -> bool:
+    # Lets orchestration skip processing entirely when artifacts equal inputs.
+    return _resolve_transform(parameters) is _noop_bytes
+
+
+def iter_process(
+    raw_inputs: Dict[str, bytes], *, parameters: Dict[str, object]
+) -> Iterator[Tuple[str, bytes]]:
+    # Parameters are validated eagerly; only the transforms are lazy.
+    fn = _resolve_transform(parameters)
+
+    return (
+        (path, fn(raw_inputs[path]))
+        for path in sorted(raw_inputs)
+    )
+
+
+def process(raw_inputs: Dict[str, bytes], *, parameters: Dict[str, object]) -> ProcessedArtifact:
+    fn = _resolve_transform(parameters)
+
+    paths = tuple(sorted(raw_inputs))
+    contents = tuple(fn(raw_inputs[p]) for p in paths)
+    return ProcessedArtifact(paths=paths, contents=contents)
+
+
+def process_parallel(
+    raw_inputs: Dict[str, bytes],
+    *,
+    parameters: Dict[str, object],
+    workers: Optional[int] = None,
+) -> ProcessedArtifact:
+    fn = _resolve_transform(parameters)
+
+    paths = tuple(sorted(raw_inputs))
+    if not paths:
+        return ProcessedArtifact(paths=(), contents=())
+
+    # Worker count only affects scheduling; results are mapped back in order.
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (4 * workers))
 
-    processed = {
-        path: _transform_bytes(data, transform)
-        for path, data in raw_inputs.items()
-    }
-    return ProcessedArtifact(items=processed)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # fn is a module-level function, so only it and the bytes are pickled.
+        results = executor.map(fn, (raw_inputs[p] for p in paths), chunksize=chunksize)
+        contents = tuple(results)
+    return ProcessedArtifact(paths=paths, contents=contents)
@@ -6,7 +6,7 @@ Provenance metadata generation layer.
 Responsibilities:
 • Construct structured provenance metadata
 • Record:
-    - Input hashes
+    - Input hashes (and the algorithm that produced them)
     - Config hash
     - Pipeline version
     - Explicit parameters
@@ -26,7 +26,23 @@ import sys
 import hashlib
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
+
+from .utils import DEFAULT_CONTENT_HASH_ALGO
+
+
+def _sha256():
+    # run_id is an identifier, not a signature (see utils._sha256).
+    return hashlib.sha256(usedforsecurity=False)
+
+
+# Environment metadata is fixed for the life of the process; platform.platform()
+# can be slow (it may shell out to uname), so it is computed once at import.
+_ENV = {
+    "python_version": sys.version.split()[0],
+    "platform": platform.platform(),
+    "implementation": platform.python_implementation(),
+}
 
 
 @dataclass(frozen=True)
@@ -36,25 +52,29 @@ class Provenance:
 
 def _compute_run_id(
     *,
-    input_hashes: Dict[str, str],
+    sorted_input_hashes: List[Tuple[str, str]],
+    content_hash_algo: str,
     config_hash: str,
     pipeline_version: str,
 ) -> str:
     """
     Deterministic run identifier derived from:
-    • Input file hashes
+    • Input file hashes (and their algorithm, unless it is the default)
     • Config hash
     • Pipeline version
 
     Does NOT include timestamp or environment.
+    Expects (path, hash) pairs already sorted by path (stable ordering).
     """
-    h = hashlib.sha256()
+    h = _sha256()
 
-    # Stable ordering
-    for path in sorted(input_hashes.keys()):
+    for path, digest in sorted_input_hashes:
         h.update(path.encode("utf-8"))
-        h.update(input_hashes[path].encode("utf-8"))
+        h.update(digest.encode("utf-8"))
 
+    # SHA256 run IDs keep the original formula, so existing IDs stay valid.
+    if content_hash_algo != DEFAULT_CONTENT_HASH_ALGO:
+        h.update(content_hash_algo.encode("utf-8"))
     h.update(config_hash.encode("utf-8"))
     h.update(pipeline_version.encode("utf-8"))
 
@@ -64,6 +84,7 @@ def _compute_run_id(
 def build_provenance(
     *,
     input_hashes: Dict[str, str],
+    content_hash_algo: str,
     config_hash: str,
     pipeline_version: str,
     parameters: Dict[str, Any],
@@ -71,30 +92,37 @@ def build_provenance(
 
     ts = datetime.now(timezone.utc).isoformat()
 
-    env = {
-        "python_version": sys.version.split()[0],
-        "platform": platform.platform(),
-        "implementation": platform.python_implementation(),
-    }
+    env = dict(_ENV)  # each Provenance owns its copy
+
+    sorted_input_hashes = sorted(input_hashes.items())
 
     run_id = _compute_run_id(
-        input_hashes=input_hashes,
+        sorted_input_hashes=sorted_input_hashes,
+        content_hash_algo=content_hash_algo,
         config_hash=config_hash,
         pipeline_version=pipeline_version,
     )
 
+    # The default layout is unchanged ("sha256" key, original scope); other
+    # algorithms are named in each input entry and in the scope.
+    if content_hash_algo == DEFAULT_CONTENT_HASH_ALGO:
+        scope = "inputs + config + pipeline_version"
+    else:
+        scope = "inputs + content_hash_algo + config + pipeline_version"
+
     prov = {
         "run_id": run_id,
         "pipeline_version": pipeline_version,
         "timestamp_utc": ts,
         "inputs": [
-            {"path": p, "sha256": h}
-            for p, h in sorted(input_hashes.items())
+            {"path": p, content_hash_algo: h}
+            for p, h in sorted_input_hashes
         ],
+        "content_hash_algo": content_hash_algo,
         "config_sha256": config_hash,
         "parameters": parameters,
         "execution_environment": env,
-        "deterministic_scope": "inputs + config + pipeline_version",
+        "deterministic_scope": scope,
     }
 
     return Provenance(data=prov)
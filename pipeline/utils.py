@@ -5,41 +5,240 @@ Shared deterministic utilities.
 
 Responsibilities:
 • Provide SHA256 hashing helpers
+• Provide content hashing for input files (SHA256, or BLAKE3 on request)
 • Provide canonical JSON serialization for stable hashing
 
 Architectural Constraints:
 • Must remain deterministic
 • No side effects
-• No I/O beyond file hashing helpers
+• No I/O beyond file hashing (and fused read + hash) helpers
 • No business logic
 
 Canonical JSON encoding is used strictly for hashing stability.
-Human-readable JSON formatting is handled elsewhere.
+Human-readable JSON formatting is handled elsewhere; exact_orjson_dumps is
+shared so both stay independent of whether orjson is installed.
 """
 
 import hashlib
 import json
+import mmap
+import os
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .hash_cache import HashCache
+
+try:  # Optional dependency: SIMD + multithreaded tree hashing.
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:  # Optional dependency: native JSON encoder that emits bytes directly.
+    import orjson
+except ImportError:
+    orjson = None
+
+# Algorithms for input file content hashes. The choice is always explicit
+# (never inferred from what happens to be installed) and is recorded in
+# provenance and folded into run_id.
+CONTENT_HASH_ALGOS = ("sha256", "blake3")
+DEFAULT_CONTENT_HASH_ALGO = "sha256"
+
+# Files at or above this size are hashed through a read-only memory map
+# instead of buffered reads (no per-chunk read() syscalls or bytes copies).
+MMAP_THRESHOLD = 10 * 1024 * 1024
+
+
+def _sha256():
+    # These digests identify content; they are not security signatures, so
+    # OpenSSL may use its non-FIPS fast path. The digest value is unchanged.
+    return hashlib.sha256(usedforsecurity=False)
 
 
 def sha256_bytes(data: bytes) -> str:
-    h = hashlib.sha256()
+    h = _sha256()
     h.update(data)
     return h.hexdigest()
 
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
+def validate_content_hash_algo(algo: str) -> None:
+    if algo not in CONTENT_HASH_ALGOS:
+        raise ValueError(f"Unsupported content hash algorithm: {algo!r}")
+    if algo == "blake3" and blake3 is None:
+        raise ValueError("Content hash algorithm 'blake3' requires the blake3 package")
+
+
+def _hasher(algo: str = DEFAULT_CONTENT_HASH_ALGO, multithreaded: bool = False):
+    validate_content_hash_algo(algo)
+    if algo == "blake3":
+        if multithreaded:
+            return blake3.blake3(max_threads=blake3.blake3.AUTO)
+        return blake3.blake3()
+    return _sha256()
+
+
+def _cache_key(path: Path, st: os.stat_result, algo: str) -> Tuple[str, int, int, int, int, str]:
+    # See hash_cache._SCHEMA for why inode and ctime are part of the key.
+    return (os.path.abspath(path), st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size, algo)
+
+
+def _advise_sequential(fd: int) -> None:
+    # Large inputs are read front to back exactly once: ask the kernel for
+    # aggressive readahead. Purely advisory, so failures are ignored. Pages
+    # are not dropped afterwards; reruns on the same inputs are the norm.
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+
+
+def content_hash_file(
+    path: Path,
+    algo: str = DEFAULT_CONTENT_HASH_ALGO,
+    cache: Optional["HashCache"] = None,
+) -> str:
+    if cache is not None:
+        key = _cache_key(path, path.stat(), algo)
+        cached = cache.get(*key)
+        if cached is not None:
+            return cached
+        digest = content_hash_file(path, algo)
+        cache.put(*key, digest)
+        return digest
+
     with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            _advise_sequential(f.fileno())
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    h = _hasher(algo, multithreaded=True)
+                    h.update(mm)
+                return h.hexdigest()
+            except (OSError, ValueError):
+                # File shrank to zero, or the filesystem does not support
+                # mapping it (e.g. some network mounts): use buffered reads.
+                f.seek(0)
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, partial(_hasher, algo)).hexdigest()
+        h = _hasher(algo)
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
     return h.hexdigest()
 
 
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+# Upper bound for a single read(): the buffer is allocated at the requested
+# size, and POSIX systems return at most ~2 GiB per call anyway.
+_READ_CHUNK = 1024 * 1024 * 1024
+# For files that report no size (st_size == 0, e.g. /proc) or grew after fstat.
+_UNSIZED_READ_CHUNK = 64 * 1024
+
+
+def _read_fd(fd: int, size: int) -> bytes:
+    # Sized to the file: normally one read() plus a 1-byte EOF probe. Loops on
+    # short reads, and in bounded chunks past the expected size.
+    chunks = []
+    remaining = size
+    while True:
+        if remaining > 0:
+            n = min(remaining, _READ_CHUNK)
+        elif remaining == 0 and size > 0:
+            n = 1
+        else:
+            n = _UNSIZED_READ_CHUNK
+        chunk = os.read(fd, n)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+def read_and_hash(path: Path, algo: str = DEFAULT_CONTENT_HASH_ALGO) -> Tuple[bytes, str]:
+    # Single pass over the file: the bytes returned are the bytes hashed.
+    # The hash cache is deliberately not consulted here: the bytes are already
+    # in memory, and hashing them is the only way to guarantee the recorded
+    # hash describes them. One raw fd serves both fstat and the read.
+    fd = os.open(path, _READ_FLAGS)
+    try:
+        st = os.fstat(fd)
+        if st.st_size >= MMAP_THRESHOLD:
+            _advise_sequential(fd)
+        data = _read_fd(fd, st.st_size)
+    finally:
+        os.close(fd)
+
+    h = _hasher(algo, multithreaded=len(data) >= MMAP_THRESHOLD)
+    h.update(data)
+    return data, h.hexdigest()
+
+
+# Backward-compatible name; SHA256 unless another algo is passed.
+sha256_file = content_hash_file
+
+
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
 def canonical_json_dumps(obj: Any) -> str:
     return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
-def sha256_json(obj: Any) -> str:
-    return sha256_bytes(canonical_json_dumps(obj).encode("utf-8"))
+def _contains_float(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return True
+    if isinstance(obj, dict):
+        return any(_contains_float(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_contains_float(v) for v in obj)
+    return False
+
+
+def exact_orjson_dumps(obj: Any, *, indent: bool = False) -> Optional[bytes]:
+    # orjson output, but only where it is byte-identical to the stdlib's
+    # json.dumps(obj, sort_keys=True, ensure_ascii=False) with the compact
+    # canonical separators, or with indent=2 when indent is set. orjson formats
+    # floats differently (1e16 vs 1e+16, NaN as null), so documents with floats
+    # are left to the stdlib. None means "use the stdlib encoder": written and
+    # hashed JSON must not depend on whether orjson is installed.
+    if orjson is None or _contains_float(obj):
+        return None
+    option = orjson.OPT_SORT_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    try:
+        return orjson.dumps(obj, option=option)
+    except TypeError:  # e.g. ints beyond 64 bits, non-str keys, lone surrogates
+        return None
+
+
+# iterencode is the pure-Python encoder, several times slower than the C one
+# behind json.dumps (and than orjson), but it never holds the whole canonical
+# document. sha256_json switches to it for documents of at least this many
+# bytes, as estimated by the caller (e.g. the size of the file parsed).
+STREAM_JSON_MIN_BYTES = 16 * 1024 * 1024
+
+
+def canonical_json_bytes(obj: Any) -> bytes:
+    encoded = exact_orjson_dumps(obj)
+    if encoded is not None:
+        return encoded
+    return canonical_json_dumps(obj).encode("utf-8")
+
+
+def sha256_json(obj: Any, size_hint: int = 0) -> str:
+    h = _sha256()
+    if size_hint >= STREAM_JSON_MIN_BYTES:
+        # Hashed incrementally, so peak memory stays at one token rather than
+        # the whole document. Same settings as canonical_json_dumps.
+        for chunk in _CANONICAL_ENCODER.iterencode(obj):
+            h.update(chunk.encode("utf-8"))
+    else:
+        h.update(canonical_json_bytes(obj))
+    return h.hexdigest()
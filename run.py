@@ -22,17 +22,14 @@ Processing remains independently callable without this module.
 
 import argparse
 import sys
-from pathlib import Path
 
 from pipeline.errors import PipelineError
-from pipeline.input_layer import load_validate_hash
-from pipeline.processing_layer import process
+from pipeline.hash_cache import open_hash_cache
+from pipeline.input_layer import hash_inputs, load_validate_hash, read_inputs_and_hash
+from pipeline.processing_layer import is_identity_transform, iter_process, process_parallel
 from pipeline.provenance_layer import build_provenance
-from pipeline.output_layer import write_outputs
-
-
-def _read_inputs(paths):
-    return {str(p): Path(p).read_bytes() for p in paths}
+from pipeline.output_layer import copy_outputs, write_outputs
+from pipeline.utils import CONTENT_HASH_ALGOS, DEFAULT_CONTENT_HASH_ALGO
 
 
 def main(argv):
@@ -41,23 +38,44 @@ def main(argv):
     parser.add_argument("--config", required=True)
     parser.add_argument("--version", required=True)
     parser.add_argument("--out", required=True)
+    parser.add_argument("--parallel", action="store_true")
+    parser.add_argument("--no-hash-cache", action="store_true")
+    parser.add_argument("--hash-algo", choices=CONTENT_HASH_ALGOS, default=DEFAULT_CONTENT_HASH_ALGO)
     args = parser.parse_args(argv)
 
+    cache = None
+
     try:
-        loaded = load_validate_hash(args.inputs, args.config, args.version)
+        loaded = load_validate_hash(args.inputs, args.config, args.version, args.hash_algo)
+
+        identity = is_identity_transform(loaded.config)
 
-        raw_inputs = _read_inputs(loaded.input_paths)
+        if identity:
+            # Artifacts are the inputs unchanged: hash in place, copy in-kernel.
+            cache = None if args.no_hash_cache else open_hash_cache()
+            input_hashes = hash_inputs(loaded.input_paths, algo=loaded.content_hash_algo, cache=cache)
+        else:
+            raw_inputs, input_hashes = read_inputs_and_hash(
+                loaded.input_paths, algo=loaded.content_hash_algo
+            )
 
-        processed = process(raw_inputs, parameters=loaded.config)
+            if args.parallel:
+                processed = process_parallel(raw_inputs, parameters=loaded.config)
+            else:
+                processed = iter_process(raw_inputs, parameters=loaded.config)
 
         provenance = build_provenance(
-            input_hashes=loaded.input_hashes,
+            input_hashes=input_hashes,
+            content_hash_algo=loaded.content_hash_algo,
             config_hash=loaded.config_hash,
             pipeline_version=loaded.pipeline_version,
             parameters=loaded.config,
         )
 
-        write_outputs(out_dir=args.out, processed=processed, provenance=provenance)
+        if identity:
+            copy_outputs(out_dir=args.out, input_paths=loaded.input_paths, provenance=provenance)
+        else:
+            write_outputs(out_dir=args.out, processed=processed, provenance=provenance)
 
         print("Run successful.")
         return 0
@@ -68,6 +86,9 @@ def main(argv):
     except Exception as e:
         print(f"UNEXPECTED ERROR: {e}", file=sys.stderr)
         return 3
+    finally:
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
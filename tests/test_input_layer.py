@@ -0,0 +1,110 @@
+"""
+test_input_layer.py
+
+Minimal tests validating:
+• Inputs are read and hashed into path-sorted mappings
+• Each digest matches the bytes it is reported for
+• Empty input lists yield empty results
+• Cached config loading reloads edited files and hands out fresh dicts
+• Large configs are hashed incrementally, to the same digest
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pipeline import utils
+from pipeline.input_layer import hash_inputs, load_validate_hash, read_inputs_and_hash
+from pipeline.utils import sha256_json
+
+
+class TestInputHashing(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.contents = {"c.txt": b"third\n", "a.txt": b"first\n", "b.txt": b""}
+        self.paths = []
+        for name, data in self.contents.items():
+            path = self.dir / name
+            path.write_bytes(data)
+            self.paths.append(path)
+
+    def _expected_keys(self):
+        return [str(self.dir / name) for name in sorted(self.contents)]
+
+    def test_read_inputs_and_hash(self):
+        raw_inputs, input_hashes = read_inputs_and_hash(self.paths)
+
+        self.assertEqual(list(raw_inputs), self._expected_keys())
+        self.assertEqual(list(input_hashes), self._expected_keys())
+        for key, data in raw_inputs.items():
+            self.assertEqual(data, self.contents[Path(key).name])
+            self.assertEqual(input_hashes[key], hashlib.sha256(data).hexdigest())
+
+    def test_hash_inputs_matches_read_inputs_and_hash(self):
+        input_hashes = hash_inputs(self.paths)
+
+        self.assertEqual(list(input_hashes), self._expected_keys())
+        self.assertEqual(input_hashes, read_inputs_and_hash(self.paths)[1])
+
+    def test_empty_inputs(self):
+        self.assertEqual(read_inputs_and_hash([]), ({}, {}))
+        self.assertEqual(hash_inputs([]), {})
+
+
+class TestConfigLoading(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.input = self.dir / "input.txt"
+        self.input.write_bytes(b"hello\n")
+        self.config = self.dir / "config.json"
+
+    def _load(self):
+        return load_validate_hash([str(self.input)], str(self.config), "v1")
+
+    def test_edited_config_is_reloaded(self):
+        self.config.write_text('{"transform": "upper", "seed": 1}', encoding="utf-8")
+        first = self._load()
+
+        # Same size, newer mtime: the cache key changes, so the file is re-read.
+        self.config.write_text('{"transform": "lower", "seed": 1}', encoding="utf-8")
+        st = self.config.stat()
+        os.utime(self.config, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        second = self._load()
+
+        self.assertEqual(first.config["transform"], "upper")
+        self.assertEqual(second.config["transform"], "lower")
+        self.assertEqual(second.config_hash, sha256_json({"transform": "lower", "seed": 1}))
+
+    def test_large_config_hash_is_streamed(self):
+        cfg = {"transform": "upper", "seed": 1, "table": {str(i): i for i in range(1000)}}
+        self.config.write_text(json.dumps(cfg), encoding="utf-8")
+
+        with mock.patch.object(utils, "STREAM_JSON_MIN_BYTES", 1024), \
+                mock.patch.object(
+                    utils._CANONICAL_ENCODER, "iterencode",
+                    wraps=utils._CANONICAL_ENCODER.iterencode,
+                ) as iterencode:
+            loaded = self._load()
+
+        self.assertTrue(iterencode.called)
+        self.assertEqual(loaded.config_hash, sha256_json(cfg))
+
+    def test_cached_config_is_not_shared(self):
+        self.config.write_text('{"transform": "upper", "seed": 1}', encoding="utf-8")
+        self._load().config["transform"] = "mutated"
+
+        self.assertEqual(self._load().config["transform"], "upper")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+"""
+test_output_layer.py
+
+Minimal tests validating:
+• Artifacts and provenance.json are written with the expected bytes and paths,
+  with and without directory-fd relative opens
+• Identity copies are byte-exact on every copy fallback tier, including
+  after a partial fast-path copy and for files larger than one chunk
+• A fast path that copies nothing, or a file that reports no size, falls
+  back to read/write instead of producing an empty artifact
+• A failed write never leaves a provenance.json marking success
+• provenance.json bytes do not depend on whether orjson is installed
+"""
+
+import errno
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pipeline import output_layer, utils
+from pipeline.output_layer import copy_outputs, write_outputs
+from pipeline.provenance_layer import Provenance
+
+
+class TestWriteOutputs(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out_dir = Path(tmp.name) / "out"
+
+    def _check_write_outputs(self):
+        processed = [("/in/a.txt", b"AAA"), ("/in/b.bin", b"\x00\xff"), ("/in/empty", b"")]
+        written = write_outputs(
+            out_dir=str(self.out_dir),
+            processed=iter(processed),
+            provenance=Provenance(data={"run_id": "r", "inputs": []}),
+        )
+
+        artifacts = self.out_dir.resolve() / "artifacts"
+        prov_file = self.out_dir.resolve() / "provenance.json"
+        self.assertEqual(
+            written,
+            {
+                "/in/a.txt": str(artifacts / "a.txt.processed"),
+                "/in/b.bin": str(artifacts / "b.bin.processed"),
+                "/in/empty": str(artifacts / "empty.processed"),
+                "provenance": str(prov_file),
+            },
+        )
+        for input_path, content in processed:
+            self.assertEqual(Path(written[input_path]).read_bytes(), content)
+        self.assertEqual(
+            prov_file.read_bytes(),
+            b'{\n  "inputs": [],\n  "run_id": "r"\n}',
+        )
+
+    def test_writes_artifacts_and_provenance(self):
+        self._check_write_outputs()
+
+    def test_writes_artifacts_without_dir_fd(self):
+        with mock.patch.object(output_layer, "_USE_DIR_FD", False):
+            self._check_write_outputs()
+
+    def test_rerun_overwrites_artifacts(self):
+        self._check_write_outputs()
+        write_outputs(
+            out_dir=str(self.out_dir),
+            processed=[("/in/a.txt", b"B")],
+            provenance=Provenance(data={"run_id": "r2"}),
+        )
+        artifact = self.out_dir / "artifacts" / "a.txt.processed"
+        self.assertEqual(artifact.read_bytes(), b"B")
+
+    def test_failed_write_removes_previous_provenance(self):
+        write_outputs(
+            out_dir=str(self.out_dir),
+            processed=[("/in/a.txt", b"OLD")],
+            provenance=Provenance(data={"run_id": "old"}),
+        )
+
+        def failing_artifacts():
+            yield "/in/a.txt", b"NEW"
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+        with self.assertRaises(UnicodeDecodeError):
+            write_outputs(
+                out_dir=str(self.out_dir),
+                processed=failing_artifacts(),
+                provenance=Provenance(data={"run_id": "new"}),
+            )
+
+        self.assertFalse((self.out_dir / "provenance.json").exists())
+
+    def _provenance_bytes(self, data):
+        write_outputs(out_dir=str(self.out_dir), processed=[], provenance=Provenance(data=data))
+        return (self.out_dir / "provenance.json").read_bytes()
+
+    def test_provenance_bytes_independent_of_orjson(self):
+        for data in (
+            {"inputs": [{"path": "/in/caf\u00e9.txt", "sha256": "ab"}], "run_id": "r"},
+            {"parameters": {"ratio": 1e16, "missing": float("nan")}, "run_id": "r"},
+            {"inputs": [{"path": "/in/\udcff.txt", "sha256": "ab"}], "run_id": "r"},
+        ):
+            with self.subTest(data=data):
+                written = self._provenance_bytes(data)
+                with mock.patch.object(utils, "orjson", None):
+                    self.assertEqual(self._provenance_bytes(data), written)
+
+
+def _unsupported(*args):
+    raise OSError(errno.ENOSYS, "not supported")
+
+
+class TestCopyOutputs(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.out_dir = self.dir / "out"
+        self.inputs = {}
+        for name, data in (
+            ("a.txt", b"hello\n"),
+            ("big.bin", bytes(range(256)) * (3 * output_layer._COPY_CHUNK // 256) + b"tail"),
+            ("empty", b""),
+        ):
+            path = self.dir / name
+            path.write_bytes(data)
+            self.inputs[str(path)] = data
+
+    def _check_copy_outputs(self):
+        written = copy_outputs(
+            out_dir=str(self.out_dir),
+            input_paths=[Path(p) for p in reversed(list(self.inputs))],
+            provenance=Provenance(data={"run_id": "r"}),
+        )
+
+        artifacts = self.out_dir.resolve() / "artifacts"
+        self.assertEqual(
+            set(written), set(self.inputs) | {"provenance"},
+        )
+        for input_path, data in self.inputs.items():
+            out_file = artifacts / f"{os.path.basename(input_path)}.processed"
+            self.assertEqual(written[input_path], str(out_file))
+            self.assertEqual(out_file.read_bytes(), data)
+        self.assertEqual(Path(written["provenance"]).read_bytes(), b'{\n  "run_id": "r"\n}')
+
+    def test_default_copy(self):
+        self._check_copy_outputs()
+
+    def test_default_copy_without_dir_fd(self):
+        with mock.patch.object(output_layer, "_USE_DIR_FD", False):
+            self._check_copy_outputs()
+
+    def test_falls_back_to_sendfile(self):
+        if not hasattr(os, "sendfile"):
+            self.skipTest("os.sendfile not available")
+        with mock.patch.object(os, "copy_file_range", side_effect=_unsupported, create=True), \
+                mock.patch.object(os, "sendfile", wraps=os.sendfile) as sendfile, \
+                mock.patch.object(os, "read", wraps=os.read) as read:
+            self._check_copy_outputs()
+        self.assertTrue(sendfile.called)
+        # Only the empty input, which skips the fast paths, is read.
+        self.assertEqual(read.call_count, 1)
+
+    def test_falls_back_to_read_write_loop(self):
+        with mock.patch.object(os, "copy_file_range", side_effect=_unsupported, create=True), \
+                mock.patch.object(os, "sendfile", side_effect=_unsupported, create=True), \
+                mock.patch.object(os, "read", wraps=os.read) as read:
+            self._check_copy_outputs()
+        # big.bin alone takes four chunks plus the EOF read.
+        self.assertGreaterEqual(read.call_count, 5)
+
+    def test_partial_fast_path_copy_is_rewound(self):
+        if not hasattr(os, "copy_file_range"):
+            self.skipTest("os.copy_file_range not available")
+        real_copy_file_range = os.copy_file_range
+
+        def copy_some_then_fail(in_fd, out_fd, count, *args):
+            if os.lseek(in_fd, 0, os.SEEK_CUR):
+                # Fail with the input offset moved past what was written.
+                os.lseek(in_fd, 2, os.SEEK_CUR)
+                raise OSError(errno.EXDEV, "cross-device")
+            return real_copy_file_range(in_fd, out_fd, min(count, 3))
+
+        with mock.patch.object(os, "copy_file_range", side_effect=copy_some_then_fail), \
+                mock.patch.object(os, "sendfile", side_effect=_unsupported, create=True):
+            self._check_copy_outputs()
+
+
+    def test_fast_paths_copying_nothing_fall_back(self):
+        # Some kernels and filesystems report 0 bytes copied for files that
+        # are not empty; that must not be taken as EOF.
+        with mock.patch.object(os, "copy_file_range", return_value=0, create=True) as cfr, \
+                mock.patch.object(os, "sendfile", return_value=0, create=True) as sendfile:
+            self._check_copy_outputs()
+        self.assertTrue(cfr.called)
+        self.assertTrue(sendfile.called)
+
+    def test_copy_file_range_copying_nothing_falls_back_to_sendfile(self):
+        if not hasattr(os, "sendfile"):
+            self.skipTest("os.sendfile not available")
+        with mock.patch.object(os, "copy_file_range", return_value=0, create=True), \
+                mock.patch.object(os, "sendfile", wraps=os.sendfile) as sendfile:
+            self._check_copy_outputs()
+        self.assertTrue(sendfile.called)
+
+    def test_unsized_file_is_copied(self):
+        src = Path("/proc/self/status")
+        if not src.is_file() or src.stat().st_size != 0:
+            self.skipTest("needs a procfs file that reports st_size == 0")
+        fd = os.open(self.dir / "out.bin", os.O_WRONLY | os.O_CREAT)
+        self.addCleanup(os.close, fd)
+        in_fd = os.open(src, os.O_RDONLY)
+        self.addCleanup(os.close, in_fd)
+
+        output_layer._copy_fd(in_fd, fd)
+
+        self.assertIn(b"Name:", (self.dir / "out.bin").read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
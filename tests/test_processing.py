@@ -8,7 +8,19 @@ Minimal tests validating:
 """
 
 import unittest
-from pipeline.processing_layer import process
+
+try:
+    from pipeline import _ctrans
+except ImportError:  # optional compiled kernel not built
+    _ctrans = None
+
+from pipeline.processing_layer import (
+    ProcessedArtifact,
+    is_identity_transform,
+    iter_process,
+    process,
+    process_parallel,
+)
 
 
 class TestProcessingLayer(unittest.TestCase):
@@ -25,7 +37,7 @@ class TestProcessingLayer(unittest.TestCase):
 
         result = process(raw_inputs, parameters=params)
 
-        self.assertEqual(result.items["file.txt"], b"HELLO WORLD")
+        self.assertEqual(result.as_dict()["file.txt"], b"HELLO WORLD")
 
     def test_deterministic_output(self):
         raw_inputs = {
@@ -40,7 +52,110 @@ class TestProcessingLayer(unittest.TestCase):
         result1 = process(raw_inputs, parameters=params)
         result2 = process(raw_inputs, parameters=params)
 
-        self.assertEqual(result1.items, result2.items)
+        self.assertEqual(result1.as_dict(), result2.as_dict())
+
+    def test_ascii_fast_path_matches_unicode_case_mapping(self):
+        data = bytes(range(128))
+
+        for transform, expected in (
+            ("upper", data.decode("ascii").upper().encode("ascii")),
+            ("lower", data.decode("ascii").lower().encode("ascii")),
+        ):
+            params = {"transform": transform, "seed": 123}
+            result = process({"file.txt": data}, parameters=params)
+            self.assertEqual(result.as_dict()["file.txt"], expected)
+
+    def test_non_ascii_transformation(self):
+        raw_inputs = {
+            "file.txt": "straße ÉCOLE".encode("utf-8")
+        }
+
+        params = {
+            "transform": "lower",
+            "seed": 123
+        }
+
+        result = process(raw_inputs, parameters=params)
+
+        self.assertEqual(result.as_dict()["file.txt"], "straße école".encode("utf-8"))
+
+    def test_artifact_paths_are_sorted(self):
+        raw_inputs = {
+            "b.txt": b"second",
+            "a.txt": b"first"
+        }
+
+        params = {
+            "transform": "noop",
+            "seed": 123
+        }
+
+        result = process(raw_inputs, parameters=params)
+
+        self.assertEqual(result.paths, ("a.txt", "b.txt"))
+        self.assertEqual(result.contents, (b"first", b"second"))
+        with self.assertRaises(ValueError):
+            ProcessedArtifact(paths=("b.txt", "a.txt"), contents=(b"", b""))
+
+    def test_iter_process_yields_sorted_artifacts(self):
+        raw_inputs = {
+            "b.txt": b"second",
+            "a.txt": b"first"
+        }
+
+        params = {
+            "transform": "upper",
+            "seed": 123
+        }
+
+        result = list(iter_process(raw_inputs, parameters=params))
+
+        self.assertEqual(result, [("a.txt", b"FIRST"), ("b.txt", b"SECOND")])
+
+    def test_iter_process_validates_parameters_eagerly(self):
+        with self.assertRaises(ValueError):
+            iter_process({"file.txt": b"x"}, parameters={"transform": "upper"})
+        with self.assertRaises(ValueError):
+            iter_process({"file.txt": b"x"}, parameters={"transform": "title", "seed": 123})
+
+    def test_parallel_matches_serial(self):
+        raw_inputs = {
+            f"file{i}.txt": f"line {i}\n".encode("utf-8") * 100
+            for i in range(10)
+        }
+
+        params = {
+            "transform": "upper",
+            "seed": 123
+        }
+
+        serial = process(raw_inputs, parameters=params)
+        parallel = process_parallel(raw_inputs, parameters=params, workers=2)
+
+        self.assertEqual(parallel, serial)
+
+    def test_identity_transform_detection(self):
+        self.assertTrue(is_identity_transform({"transform": "noop", "seed": 123}))
+        self.assertFalse(is_identity_transform({"transform": "upper", "seed": 123}))
+        with self.assertRaises(ValueError):
+            is_identity_transform({"transform": "noop"})
+
+
+@unittest.skipUnless(_ctrans is not None, "pipeline._ctrans extension not built")
+class TestCompiledKernel(unittest.TestCase):
+
+    def test_matches_bytes_case_mapping(self):
+        sample = bytes(range(128))
+        for n in (0, 31, 32, 33, 1000):
+            data = (sample * (n // len(sample) + 1))[:n]
+            self.assertEqual(_ctrans.ascii_upper(data), data.upper())
+            self.assertEqual(_ctrans.ascii_lower(data), data.lower())
+
+    def test_accepts_bytes_like_inputs(self):
+        data = b"Hello, World! abc XYZ" * 3
+        for value in (bytearray(data), memoryview(data)):
+            self.assertEqual(_ctrans.ascii_upper(value), data.upper())
+            self.assertEqual(_ctrans.ascii_lower(value), data.lower())
 
 
 if __name__ == "__main__":
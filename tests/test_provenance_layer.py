@@ -0,0 +1,52 @@
+"""
+test_provenance_layer.py
+
+Minimal tests validating:
+• The default SHA256 provenance keeps the original layout and run_id formula
+• Other content hash algorithms are named in inputs and covered by run_id
+"""
+
+import hashlib
+import unittest
+
+from pipeline.provenance_layer import build_provenance
+
+
+def _build(content_hash_algo):
+    return build_provenance(
+        input_hashes={"/data/b.txt": "22", "/data/a.txt": "11"},
+        content_hash_algo=content_hash_algo,
+        config_hash="cfg",
+        pipeline_version="v1",
+        parameters={"transform": "upper", "seed": 123},
+    ).data
+
+
+class TestProvenanceLayer(unittest.TestCase):
+
+    def test_inputs_keyed_by_algorithm(self):
+        for algo in ("sha256", "blake3"):
+            data = _build(algo)
+            self.assertEqual(data["content_hash_algo"], algo)
+            self.assertEqual(
+                data["inputs"],
+                [{"path": "/data/a.txt", algo: "11"}, {"path": "/data/b.txt", algo: "22"}],
+            )
+
+    def test_default_run_id_matches_original_formula(self):
+        h = hashlib.sha256()
+        for part in ("/data/a.txt", "11", "/data/b.txt", "22", "cfg", "v1"):
+            h.update(part.encode("utf-8"))
+
+        data = _build("sha256")
+
+        self.assertEqual(data["run_id"], h.hexdigest())
+        self.assertEqual(data["deterministic_scope"], "inputs + config + pipeline_version")
+
+    def test_run_id_depends_on_algorithm_not_environment(self):
+        self.assertEqual(_build("sha256")["run_id"], _build("sha256")["run_id"])
+        self.assertNotEqual(_build("sha256")["run_id"], _build("blake3")["run_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+test_run.py
+
+Minimal end-to-end tests validating:
+• A run that fails mid-processing does not look like a success
+• A noop run copies every input byte-for-byte
+"""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import run
+
+
+class TestRun(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.out_dir = self.dir / "out"
+
+    def _write(self, name, data):
+        path = self.dir / name
+        path.write_bytes(data)
+        return path
+
+    def _run(self, inputs, config):
+        argv = [
+            "--inputs", *[str(p) for p in inputs],
+            "--config", str(config),
+            "--version", "v1",
+            "--out", str(self.out_dir),
+            "--no-hash-cache",
+        ]
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return run.main(argv)
+
+    def test_failed_rerun_leaves_no_provenance(self):
+        config = self._write("config.json", b'{"transform": "upper", "seed": 123}')
+        a = self._write("a.txt", b"old")
+        b = self._write("b.txt", b"fine")
+        self.assertEqual(self._run([a, b], config), 0)
+        self.assertTrue((self.out_dir / "provenance.json").exists())
+
+        a.write_bytes(b"new")
+        b.write_bytes(b"\xff\xfe not utf-8")
+
+        self.assertEqual(self._run([a, b], config), 3)
+        self.assertFalse((self.out_dir / "provenance.json").exists())
+
+    def test_noop_run_copies_inputs(self):
+        config = self._write("config.json", b'{"transform": "noop", "seed": 123}')
+        inputs = {
+            self._write("a.txt", b"caf\xc3\xa9\n"): b"caf\xc3\xa9\n",
+            self._write("b.bin", b"\xff\xfe not utf-8"): b"\xff\xfe not utf-8",
+            self._write("empty.txt", b""): b"",
+        }
+
+        self.assertEqual(self._run(list(inputs), config), 0)
+
+        for path, data in inputs.items():
+            artifact = self.out_dir / "artifacts" / f"{path.name}.processed"
+            self.assertEqual(artifact.read_bytes(), data)
+        self.assertTrue((self.out_dir / "provenance.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+test_utils.py
+
+Minimal tests validating:
+• File hashing matches the content hasher over the raw bytes
+• Memory-mapped and buffered hashing paths agree
+• Fused read + hash returns the file bytes and their hash
+• File reads are sized to the file and bounded per call
+• Cached hashes are reused only while path, inode, mtime, ctime and size
+  match, so a rewrite with a restored mtime is re-hashed
+• The default cache location is resolved lazily and may be unavailable
+• Canonical JSON bytes and hashes do not depend on the encoder in use
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pipeline import utils
+from pipeline.hash_cache import HashCache, open_hash_cache
+
+
+def _digest(data):
+    h = utils._hasher()
+    h.update(data)
+    return h.hexdigest()
+
+
+class TestFileHashing(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, data):
+        path = Path(self.tmp.name) / name
+        path.write_bytes(data)
+        return path
+
+    def test_buffered_and_mmap_paths_agree(self):
+        data = b"deterministic pipeline\n" * 1000
+        path = self._write("input.txt", data)
+        expected = _digest(data)
+
+        self.assertEqual(utils.content_hash_file(path), expected)
+        with mock.patch.object(utils, "MMAP_THRESHOLD", 1):
+            self.assertEqual(utils.content_hash_file(path), expected)
+
+    def test_empty_file(self):
+        path = self._write("empty.txt", b"")
+
+        with mock.patch.object(utils, "MMAP_THRESHOLD", 0):
+            self.assertEqual(utils.content_hash_file(path), _digest(b""))
+
+    def test_algorithm_is_explicit(self):
+        path = self._write("input.txt", b"hello world\n")
+
+        self.assertEqual(utils.content_hash_file(path), _digest(b"hello world\n"))
+        with self.assertRaises(ValueError):
+            utils.content_hash_file(path, algo="md5")
+        if utils.blake3 is None:
+            with self.assertRaises(ValueError):
+                utils.content_hash_file(path, algo="blake3")
+
+    def test_sha256_file_alias(self):
+        self.assertIs(utils.sha256_file, utils.content_hash_file)
+
+    def test_read_and_hash_matches_content_hash(self):
+        data = b"hello world\n"
+        path = self._write("input.txt", data)
+
+        content, digest = utils.read_and_hash(path)
+
+        self.assertEqual(content, data)
+        self.assertEqual(digest, utils.content_hash_file(path))
+
+    def test_read_and_hash_large_and_empty_files(self):
+        for name, data in (("empty.txt", b""), ("large.bin", bytes(range(256)) * 20000)):
+            path = self._write(name, data)
+            self.assertEqual(utils.read_and_hash(path), (data, _digest(data)))
+
+    def test_read_fd_sizes_reads_to_the_file(self):
+        data = b"x" * 5000
+        path = self._write("input.txt", data)
+
+        with mock.patch.object(os, "read", wraps=os.read) as read:
+            self.assertEqual(utils.read_and_hash(path)[0], data)
+        self.assertEqual([c.args[1] for c in read.call_args_list], [5000, 1])
+
+        with mock.patch.object(os, "read", wraps=os.read) as read, \
+                mock.patch.object(utils, "_READ_CHUNK", 2048):
+            self.assertEqual(utils.read_and_hash(path)[0], data)
+        self.assertEqual([c.args[1] for c in read.call_args_list], [2048, 2048, 904, 1])
+
+    def test_read_fd_unsized_and_grown_files(self):
+        data = b"y" * 100
+        path = self._write("input.txt", data)
+        fd = os.open(path, os.O_RDONLY)
+        self.addCleanup(os.close, fd)
+
+        with mock.patch.object(os, "read", wraps=os.read) as read:
+            self.assertEqual(utils._read_fd(fd, 0), data)
+        self.assertEqual(
+            [c.args[1] for c in read.call_args_list],
+            [utils._UNSIZED_READ_CHUNK] * 2,
+        )
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        with mock.patch.object(os, "read", wraps=os.read) as read:
+            self.assertEqual(utils._read_fd(fd, 40), data)
+        self.assertEqual(
+            [c.args[1] for c in read.call_args_list],
+            [40, 1] + [utils._UNSIZED_READ_CHUNK] * 2,
+        )
+
+    def test_hash_cache_serves_unchanged_files_without_hashing(self):
+        data = b"hello world\n"
+        path = self._write("input.txt", data)
+        cache = HashCache(Path(self.tmp.name) / "cache" / "hashes.sqlite")
+        self.addCleanup(cache.close)
+
+        digest = utils.content_hash_file(path, cache=cache)
+        self.assertEqual(digest, _digest(data))
+        self.assertEqual(cache.get(*utils._cache_key(path, path.stat(), "sha256")), digest)
+
+        with mock.patch.object(utils, "_hasher", side_effect=AssertionError("hashed on a hit")):
+            self.assertEqual(utils.content_hash_file(path, cache=cache), digest)
+
+        # Same size, newer mtime: a miss, so the new content is hashed.
+        path.write_bytes(b"HELLO WORLD\n")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertEqual(utils.content_hash_file(path, cache=cache), _digest(b"HELLO WORLD\n"))
+
+    def test_hash_cache_misses_after_rewrite_with_restored_mtime(self):
+        path = self._write("in.txt", b"aaaa")
+        cache = HashCache(Path(self.tmp.name) / "cache" / "hashes.sqlite")
+        self.addCleanup(cache.close)
+        st = path.stat()
+        self.assertEqual(utils.content_hash_file(path, cache=cache), _digest(b"aaaa"))
+
+        # Same size, mtime put back (as cp -p or rsync -t would): still a miss.
+        time.sleep(0.01)
+        path.write_bytes(b"bbbb")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(path.stat().st_mtime_ns, st.st_mtime_ns)
+
+        self.assertEqual(utils.content_hash_file(path, cache=cache), _digest(b"bbbb"))
+
+    def test_open_hash_cache_without_home(self):
+        with mock.patch.object(Path, "home", side_effect=RuntimeError("no home")):
+            self.assertIsNone(open_hash_cache())
+        with mock.patch.object(Path, "home", return_value=Path("~")):
+            self.assertIsNone(open_hash_cache())
+
+
+class TestCanonicalJson(unittest.TestCase):
+
+    def _check_matches_stdlib(self, size_hint=0):
+        for obj in (
+            {"transform": "upper", "seed": 123, "nested": {"b": [1, 2], "a": "é"}},
+            {"ratio": 1e16, "tiny": 1e-05, "big": 2 ** 70},
+            [None, True, False, "\u2028"],
+        ):
+            self.assertEqual(
+                utils.canonical_json_bytes(obj),
+                utils.canonical_json_dumps(obj).encode("utf-8"),
+            )
+            self.assertEqual(
+                utils.sha256_json(obj, size_hint=size_hint),
+                utils.sha256_bytes(utils.canonical_json_dumps(obj).encode("utf-8")),
+            )
+
+    def test_matches_stdlib_canonical_encoding(self):
+        self._check_matches_stdlib()
+
+    def test_matches_without_orjson(self):
+        with mock.patch.object(utils, "orjson", None):
+            self._check_matches_stdlib()
+
+    def test_streamed_hash_matches(self):
+        # Large documents are streamed even when orjson is installed.
+        with mock.patch.object(
+            utils._CANONICAL_ENCODER, "iterencode",
+            wraps=utils._CANONICAL_ENCODER.iterencode,
+        ) as iterencode:
+            self._check_matches_stdlib()
+            self.assertEqual(iterencode.call_count, 0)
+            self._check_matches_stdlib(size_hint=utils.STREAM_JSON_MIN_BYTES)
+        self.assertEqual(iterencode.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()